@@ -3,9 +3,8 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 import logging
-import json
 
-from services.car_agent_client import agent_client, AgentStatus
+from services.car_agent_client import agent_client, AgentStatus, sse_event
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -40,7 +39,7 @@ async def diagnose_stream(message: str = Query(..., description="The diagnostic
             logger.info("Stream generation completed")
         except Exception as e:
             logger.error(f"Error during stream generation: {e}")
-            yield f"data: {json.dumps({'error': f'Stream error: {str(e)}'})}\n\n"
+            yield sse_event({'error': f'Stream error: {str(e)}'})
     
     logger.info("Returning StreamingResponse")
     return StreamingResponse(generate_stream(), media_type="text/event-stream")
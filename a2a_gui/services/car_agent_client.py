@@ -1,17 +1,21 @@
 import os
-import json
 import time
 import random
 import string
 from typing import AsyncGenerator, Optional, Dict, Any
 
 import httpx
+import orjson
 from fastapi import HTTPException
 from pydantic import BaseModel
 
 CAR_AGENT_URL = os.getenv("CAR_AGENT_URL", "http://localhost:10011")
 CAR_AGENT_TIMEOUT = int(os.getenv("CAR_AGENT_TIMEOUT", "10"))
 
+def sse_event(payload: Dict[str, Any]) -> str:
+    """Encode a payload as a Server-Sent Events data frame."""
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
+
 class AgentStatus(BaseModel):
     available: bool
     agent_url: str
@@ -88,37 +92,37 @@ class CarAgentClient:
                 if response.status_code != 200:
                     error_text = await response.aread()
                     print(f"Stream error response: {error_text.decode()}")
-                    yield f"data: {json.dumps({'error': f'Agent error {response.status_code}: {error_text.decode()}'})}\n\n"
+                    yield sse_event({'error': f'Agent error {response.status_code}: {error_text.decode()}'})
                     return
 
                 async for line in response.aiter_lines():
                     print(f"Received line: {line}")
                     if line.startswith("data:"):
                         try:
-                            data_json = json.loads(line[5:])
+                            data_json = orjson.loads(line[5:])
                             if "result" in data_json and "kind" in data_json["result"]:
                                 result = data_json["result"]
                                 if result["kind"] == "status-update" and "status" in result and "message" in result["status"]:
                                     if result["status"]["message"] and result["status"]["message"]["parts"]:
                                         for part in result["status"]["message"]["parts"]:
                                             if part.get("kind") == "text" and part.get("text"):
-                                                yield f"data: {json.dumps({'content': part['text']})}\n\n"
-                        except json.JSONDecodeError as e:
+                                                yield sse_event({'content': part['text']})
+                        except orjson.JSONDecodeError as e:
                             print(f"JSON decode error: {e}")
                             continue
                     elif line.strip():  # Handle other types of lines
                         print(f"Non-data line: {line}")
                 
-                yield f"data: {json.dumps({'status': 'complete'})}\n\n"
+                yield sse_event({'status': 'complete'})
         except httpx.ReadTimeout as e:
             print(f"Read timeout during streaming: {e}")
-            yield f"data: {json.dumps({'error': f'Read timeout: {str(e)}'})}\n\n"
+            yield sse_event({'error': f'Read timeout: {str(e)}'})
         except httpx.RequestError as e:
             print(f"Request error during streaming: {e}")
-            yield f"data: {json.dumps({'error': f'Connection error: {str(e)}'})}\n\n"
+            yield sse_event({'error': f'Connection error: {str(e)}'})
         except Exception as e:
             print(f"Unexpected error during streaming: {e}")
-            yield f"data: {json.dumps({'error': f'Unexpected error: {str(e)}'})}\n\n"
+            yield sse_event({'error': f'Unexpected error: {str(e)}'})
 
     async def close(self):
         """Close the HTTP client."""
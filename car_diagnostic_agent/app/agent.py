@@ -12,11 +12,31 @@ from .bluetooth_obd_interface import BluetoothOBDInterfaceManager as OBDInterfac
 
 from .obd_services import DTCReaderService, LiveDataService, VehicleInfoService
 from .obd_config import config_manager
-from .obd_models import DTCInfo, LiveDataReading, VehicleInfo, DiagnosticSession, DTCSeverity, DTCStatus
+from .obd_models import DTCInfo, LiveDataReading, VehicleInfo, DiagnosticSession
 
 
 logger = logging.getLogger(__name__)
 
+# Display markers used when reporting scan results
+_SEVERITY_EMOJI = {"critical": "🔴", "warning": "🟡", "info": "🔵"}
+
+# DTC groups used by hypothesis generation and data validation
+_FUEL_TRIM_CODES = frozenset({"P0171", "P0172", "P0174", "P0175"})
+_CATALYST_CODES = frozenset({"P0420", "P0430"})
+_MAF_CODES = frozenset({"P0100", "P0101", "P0102", "P0103"})
+
+# Fixed-shape sections of the enhanced Gemini prompt
+_OBD_ANALYSIS_REQUEST = (
+    "Please analyze this real-time diagnostic data and provide your expert assessment. "
+    "Consider the diagnostic hypotheses provided and determine the most likely root cause. "
+    "Include confidence levels for your diagnoses and recommend specific repair steps. "
+    "Address any validation warnings in your analysis."
+)
+_OBD_NOT_CONNECTED_NOTE = (
+    "\n\nNote: OBD adapter not connected. Analysis based on provided information only. "
+    "For real-time diagnostics, please connect to the vehicle's OBD-II port."
+)
+
 
 class CarDiagnosticAgent:
     """Car Diagnostic Agent - an AI car mechanic with persistent OBD connections."""
@@ -73,6 +93,7 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
         self.live_data_service = None
         self.vehicle_info_service = None
         self.current_session: Optional[DiagnosticSession] = None
+        self._vehicle_info: Optional[VehicleInfo] = None  # Read once per connection
         
         # OBD system will be initialized by the server startup event
     
@@ -126,6 +147,7 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
         try:
             response = await self.obd_manager.connect(config)
             if response.success:
+                self._forget_vehicle_info()
                 config_manager.save_successful_connection(self.obd_manager.config)
                 logger.info("OBD connection established with persistent connection support")
             return {"success": response.success, "data": response.data, "error": response.error_message}
@@ -140,12 +162,17 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
         
         try:
             response = await self.obd_manager.disconnect()
+            self._forget_vehicle_info()
             logger.info("OBD disconnected and persistent connection tasks stopped")
             return {"success": response.success, "data": response.data, "error": response.error_message}
         except Exception as e:
             logger.error(f"OBD disconnection failed: {e}")
             return {"success": False, "error": str(e)}
     
+    def _forget_vehicle_info(self):
+        """Drop the cached vehicle info so the next scan re-reads it."""
+        self._vehicle_info = None
+    
     async def start_diagnostic_session(self) -> Optional[DiagnosticSession]:
         """Start a new diagnostic session."""
         try:
@@ -182,6 +209,7 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
         if not self.obd_manager or not self.obd_manager.is_connected:
             return diagnostic_data
         
+        dtcs: List[DTCInfo] = []
         try:
             diagnostic_data["obd_connected"] = True
             
@@ -207,33 +235,28 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
                         "name": reading.name,
                         "value": reading.value,
                         "unit": reading.unit,
-                        "in_range": reading.is_within_range,
+                        "in_range": reading.in_range,
                         "timestamp": reading.timestamp.isoformat()
                     }
                     for pid, reading in live_data.items()
                 }
             
-            # Get vehicle info
-            if self.vehicle_info_service and not diagnostic_data["vehicle_info"]:
-                vehicle_info = await self.vehicle_info_service.get_vehicle_info()
-                if vehicle_info:
-                    diagnostic_data["vehicle_info"] = {
-                        "vin": vehicle_info.vin,
-                        "make": vehicle_info.make,
-                        "model": vehicle_info.model,
-                        "year": vehicle_info.year,
-                        "engine_type": vehicle_info.engine_type
-                    }
+            # Get vehicle info; it cannot change while connected, so read it once per connection
+            if self._vehicle_info is None and self.vehicle_info_service:
+                self._vehicle_info = await self.vehicle_info_service.get_vehicle_info()
+            vehicle_info = self._vehicle_info
+            if vehicle_info:
+                diagnostic_data["vehicle_info"] = {
+                    "vin": vehicle_info.vin,
+                    "make": vehicle_info.make,
+                    "model": vehicle_info.model,
+                    "year": vehicle_info.year,
+                    "engine_type": vehicle_info.engine_type
+                }
             
             # Add to current session if active
             if self.current_session:
-                for dtc_data in diagnostic_data["dtcs"]:
-                    dtc_info = DTCInfo(
-                        code=dtc_data["code"],
-                        description=dtc_data["description"],
-                        severity=DTCSeverity(dtc_data["severity"]),
-                        status=DTCStatus(dtc_data["status"])
-                    )
+                for dtc_info in dtcs:
                     self.current_session.add_dtc(dtc_info)
         
         except Exception as e:
@@ -293,28 +316,31 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
         
         result = await self.connect_obd()
         
+        # Send the outcome as a single chunk; every yield becomes its own A2A status event
+        lines = []
         if result["success"]:
-            yield "✅ Successfully connected to your vehicle with persistent connection!\n\n"
+            lines.append("✅ Successfully connected to your vehicle with persistent connection!\n\n")
             
             # Get connection info
             if self.obd_manager:
                 conn_info = await self.obd_manager.get_connection_info()
-                yield f"📡 Connection Details:\n"
-                yield f"- Port: {conn_info.get('port', 'Unknown')}\n"
-                yield f"- Protocol: {conn_info.get('protocol', 'Unknown')}\n"
-                yield f"- Supported Commands: {conn_info.get('supported_commands', 0)}\n\n"
+                lines.append("📡 Connection Details:\n")
+                lines.append(f"- Port: {conn_info.get('port', 'Unknown')}\n")
+                lines.append(f"- Protocol: {conn_info.get('protocol', 'Unknown')}\n")
+                lines.append(f"- Supported Commands: {conn_info.get('supported_commands', 0)}\n\n")
             
-            yield "I'm now ready to read live diagnostic data from your vehicle. "
-            yield "The connection will be maintained automatically with keep-alive mechanisms. "
-            yield "You can ask me to scan for trouble codes or request specific parameter readings.\n"
+            lines.append("I'm now ready to read live diagnostic data from your vehicle. ")
+            lines.append("The connection will be maintained automatically with keep-alive mechanisms. ")
+            lines.append("You can ask me to scan for trouble codes or request specific parameter readings.\n")
         else:
-            yield f"❌ Failed to connect to OBD adapter: {result.get('error', 'Unknown error')}\n\n"
-            yield "Please check:\n"
-            yield "- OBD adapter is properly connected\n"
-            yield "- Vehicle is turned on (ignition on)\n"
-            yield "- Adapter drivers are installed\n"
-            yield "- No other software is using the OBD port\n\n"
-            yield "You can still provide DTCs manually for diagnosis.\n"
+            lines.append(f"❌ Failed to connect to OBD adapter: {result.get('error', 'Unknown error')}\n\n")
+            lines.append("Please check:\n")
+            lines.append("- OBD adapter is properly connected\n")
+            lines.append("- Vehicle is turned on (ignition on)\n")
+            lines.append("- Adapter drivers are installed\n")
+            lines.append("- No other software is using the OBD port\n\n")
+            lines.append("You can still provide DTCs manually for diagnosis.\n")
+        yield "".join(lines)
     
     async def _handle_obd_disconnect_command(self) -> AsyncIterable[str]:
         """Handle OBD disconnection command with persistent connection cleanup."""
@@ -323,8 +349,10 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
         result = await self.disconnect_obd()
         
         if result["success"]:
-            yield "✅ Successfully disconnected from OBD adapter and stopped persistent connection tasks.\n\n"
-            yield "I'll now work with manually provided DTCs and information.\n"
+            yield (
+                "✅ Successfully disconnected from OBD adapter and stopped persistent connection tasks.\n\n"
+                "I'll now work with manually provided DTCs and information.\n"
+            )
         else:
             yield f"⚠️  Disconnection issue: {result.get('error', 'Unknown error')}\n\n"
     
@@ -339,39 +367,42 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
         # Get diagnostic data
         obd_data = await self.get_obd_diagnostic_data()
         
+        # Build the whole report and send it as a single chunk
+        lines = []
+        
         # Report findings
         if obd_data.get("dtcs"):
-            yield f"📋 Found {len(obd_data['dtcs'])} trouble codes:\n\n"
+            lines.append(f"📋 Found {len(obd_data['dtcs'])} trouble codes:\n\n")
             for dtc in obd_data["dtcs"]:
-                severity_emoji = {"critical": "🔴", "warning": "🟡", "info": "🔵"}
-                emoji = severity_emoji.get(dtc["severity"], "ℹ️")
-                yield f"{emoji} **{dtc['code']}**: {dtc['description']}\n"
+                emoji = _SEVERITY_EMOJI.get(dtc["severity"], "ℹ️")
+                lines.append(f"{emoji} **{dtc['code']}**: {dtc['description']}\n")
         else:
-            yield "✅ No trouble codes found - your vehicle is running clean!\n\n"
+            lines.append("✅ No trouble codes found - your vehicle is running clean!\n\n")
         
         # Report live data if available
         if obd_data.get("live_data"):
-            yield "\n📊 **Current Engine Parameters:**\n"
+            lines.append("\n📊 **Current Engine Parameters:**\n")
             for pid, data in obd_data["live_data"].items():
                 status_emoji = "✅" if data["in_range"] else "⚠️"
-                yield f"{status_emoji} {data['name']}: {data['value']} {data['unit']}\n"
+                lines.append(f"{status_emoji} {data['name']}: {data['value']} {data['unit']}\n")
         
         # Vehicle info
         if obd_data.get("vehicle_info"):
             v_info = obd_data["vehicle_info"]
-            yield f"\n🚗 **Vehicle Information:**\n"
+            lines.append("\n🚗 **Vehicle Information:**\n")
             if v_info.get("make") and v_info.get("model"):
-                yield f"- Make & Model: {v_info['make']} {v_info['model']}\n"
+                lines.append(f"- Make & Model: {v_info['make']} {v_info['model']}\n")
             if v_info.get("year"):
-                yield f"- Year: {v_info['year']}\n"
+                lines.append(f"- Year: {v_info['year']}\n")
             if v_info.get("vin"):
-                yield f"- VIN: {v_info['vin']}\n"
+                lines.append(f"- VIN: {v_info['vin']}\n")
         
-        yield "\n💬 What would you like me to help you with regarding these findings?\n"
+        lines.append("\n💬 What would you like me to help you with regarding these findings?\n")
+        yield "".join(lines)
     
     async def _prepare_enhanced_query(self, original_query: str, obd_data: Dict[str, Any]) -> str:
         """Prepare an enhanced query with OBD data integration."""
-        enhanced_parts = [original_query]
+        enhanced_parts: List[str] = [original_query]
         
         # Add OBD diagnostic data if available
         if obd_data.get("obd_connected") and (obd_data.get("dtcs") or obd_data.get("live_data")):
@@ -387,10 +418,10 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
             # Add DTCs
             if obd_data.get("dtcs"):
                 enhanced_parts.append(f"\nDiagnostic Trouble Codes ({len(obd_data['dtcs'])} found):")
-                for dtc in obd_data["dtcs"]:
-                    enhanced_parts.append(
-                        f"- {dtc['code']}: {dtc['description']} (Severity: {dtc['severity']}, Status: {dtc['status']})"
-                    )
+                enhanced_parts.extend(
+                    f"- {dtc['code']}: {dtc['description']} (Severity: {dtc['severity']}, Status: {dtc['status']})"
+                    for dtc in obd_data["dtcs"]
+                )
             else:
                 enhanced_parts.append("\nNo Diagnostic Trouble Codes found.")
             
@@ -399,9 +430,7 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
                 enhanced_parts.append("\nCurrent Engine Parameters:")
                 for pid, data in obd_data["live_data"].items():
                     range_status = "NORMAL" if data["in_range"] else "OUT OF RANGE"
-                    enhanced_parts.append(
-                        f"- {data['name']}: {data['value']} {data['unit']} ({range_status})"
-                    )
+                    enhanced_parts.append(f"- {data['name']}: {data['value']} {data['unit']} ({range_status})")
             
             # Generate and add diagnostic hypotheses
             hypotheses = await self._generate_diagnostic_hypotheses(obd_data)
@@ -410,29 +439,19 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
                 for i, hypothesis in enumerate(hypotheses, 1):
                     enhanced_parts.append(f"\n{i}. {hypothesis['title']} (Confidence: {hypothesis['confidence']})")
                     enhanced_parts.append(f"   Description: {hypothesis['description']}")
-                    enhanced_parts.append(f"   Likely Causes:")
-                    for cause in hypothesis["likely_causes"]:
-                        enhanced_parts.append(f"   - {cause}")
+                    enhanced_parts.append("   Likely Causes:")
+                    enhanced_parts.extend(f"   - {cause}" for cause in hypothesis["likely_causes"])
             
             # Add validation warnings
             validation_warnings = await self._validate_diagnostic_data(obd_data)
             if validation_warnings:
                 enhanced_parts.append("\n=== DATA VALIDATION WARNINGS ===")
-                for warning in validation_warnings:
-                    enhanced_parts.append(f"\n{warning}")
+                enhanced_parts.extend(f"\n{warning}" for warning in validation_warnings)
             
             enhanced_parts.append("\n=== END OBD DATA ===")
-            enhanced_parts.append(
-                "Please analyze this real-time diagnostic data and provide your expert assessment. "
-                "Consider the diagnostic hypotheses provided and determine the most likely root cause. "
-                "Include confidence levels for your diagnoses and recommend specific repair steps. "
-                "Address any validation warnings in your analysis."
-            )
+            enhanced_parts.append(_OBD_ANALYSIS_REQUEST)
         elif not obd_data.get("obd_connected"):
-            enhanced_parts.append(
-                "\n\nNote: OBD adapter not connected. Analysis based on provided information only. "
-                "For real-time diagnostics, please connect to the vehicle's OBD-II port."
-            )
+            enhanced_parts.append(_OBD_NOT_CONNECTED_NOTE)
         
         return "\n".join(enhanced_parts)
     
@@ -449,12 +468,11 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
         hypotheses = []
         
         # Extract key data
-        dtcs = obd_data.get("dtcs", [])
+        dtc_codes = [dtc["code"] for dtc in obd_data.get("dtcs", [])]
         live_data = obd_data.get("live_data", {})
-        vehicle_info = obd_data.get("vehicle_info", {})
         
         # Hypothesis 1: Fuel system issues (based on P0171, P0174 codes)
-        fuel_system_codes = [dtc for dtc in dtcs if dtc["code"] in ["P0171", "P0172", "P0174", "P0175"]]
+        fuel_system_codes = [code for code in dtc_codes if code in _FUEL_TRIM_CODES]
         if fuel_system_codes:
             hypotheses.append({
                 "id": "fuel_system",
@@ -468,11 +486,11 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
                     "Clogged fuel filter"
                 ],
                 "confidence": "High" if len(fuel_system_codes) > 1 else "Medium",
-                "dtcs": [dtc["code"] for dtc in fuel_system_codes]
+                "dtcs": fuel_system_codes
             })
         
         # Hypothesis 2: Ignition system issues (based on misfire codes)
-        misfire_codes = [dtc for dtc in dtcs if dtc["code"].startswith("P03")]
+        misfire_codes = [code for code in dtc_codes if code.startswith("P03")]
         if misfire_codes:
             hypotheses.append({
                 "id": "ignition_system",
@@ -484,12 +502,12 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
                     "Bad spark plug wires",
                     "Low compression in cylinders"
                 ],
-                "confidence": "High" if any("P0300" in dtc["code"] for dtc in misfire_codes) else "Medium",
-                "dtcs": [dtc["code"] for dtc in misfire_codes]
+                "confidence": "High" if "P0300" in misfire_codes else "Medium",
+                "dtcs": misfire_codes
             })
         
         # Hypothesis 3: Emission system issues (based on catalyst codes)
-        emission_codes = [dtc for dtc in dtcs if dtc["code"] in ["P0420", "P0430"]]
+        emission_codes = [code for code in dtc_codes if code in _CATALYST_CODES]
         if emission_codes:
             hypotheses.append({
                 "id": "emission_system",
@@ -502,11 +520,11 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
                     "Faulty oxygen sensors"
                 ],
                 "confidence": "High",
-                "dtcs": [dtc["code"] for dtc in emission_codes]
+                "dtcs": emission_codes
             })
         
         # Hypothesis 4: EVAP system issues (based on EVAP codes)
-        evap_codes = [dtc for dtc in dtcs if dtc["code"].startswith("P04") and dtc["code"] not in ["P0420", "P0430"]]
+        evap_codes = [code for code in dtc_codes if code.startswith("P04") and code not in _CATALYST_CODES]
         if evap_codes:
             hypotheses.append({
                 "id": "evap_system",
@@ -519,7 +537,7 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
                     "Purge valve malfunction"
                 ],
                 "confidence": "Medium",
-                "dtcs": [dtc["code"] for dtc in evap_codes]
+                "dtcs": evap_codes
             })
         
         # Hypothesis 5: Sensor issues based on out-of-range parameters
@@ -560,7 +578,7 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
         dtc_codes = [dtc["code"] for dtc in dtcs]
         
         # Check for fuel system codes with misfire codes (common combination)
-        fuel_codes = [code for code in dtc_codes if code in ["P0171", "P0172", "P0174", "P0175"]]
+        fuel_codes = [code for code in dtc_codes if code in _FUEL_TRIM_CODES]
         misfire_codes = [code for code in dtc_codes if code.startswith("P03")]
         if fuel_codes and misfire_codes:
             warnings.append(
@@ -570,19 +588,19 @@ Maintain a helpful and knowledgeable tone throughout. If you detect critical iss
             )
         
         # Check for MAF sensor codes with fuel trim codes
-        maf_codes = [code for code in dtc_codes if code in ["P0100", "P0101", "P0102", "P0103"]]
-        fuel_trim_codes = [code for code in dtc_codes if code in ["P0171", "P0172", "P0174", "P0175"]]
-        if maf_codes and fuel_trim_codes:
+        maf_codes = [code for code in dtc_codes if code in _MAF_CODES]
+        if maf_codes and fuel_codes:
             warnings.append(
                 "⚠️  Data Validation Note: MAF sensor codes and fuel trim codes detected together. "
                 "A faulty MAF sensor often causes incorrect fuel trim values. Consider testing the MAF sensor."
             )
         
         # Check for out-of-range parameters that might explain codes
-        out_of_range_params = []
-        for pid, data in live_data.items():
-            if not data["in_range"]:
-                out_of_range_params.append(f"{data['name']}: {data['value']} {data['unit']}")
+        out_of_range_params = [
+            f"{data['name']}: {data['value']} {data['unit']}"
+            for data in live_data.values()
+            if not data["in_range"]
+        ]
         
         if out_of_range_params and dtc_codes:
             warnings.append(
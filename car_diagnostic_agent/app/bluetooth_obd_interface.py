@@ -9,11 +9,11 @@ It also includes a persistent connection manager to ensure stable communication.
 import asyncio
 import logging
 import obd
+import re
 import serial
-import serial.tools.list_ports
 import subprocess
-import time
 import sys
+import time
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -25,6 +25,23 @@ from .obd_models import (
 
 logger = logging.getLogger(__name__)
 
+# Name fragments identifying OBD adapters (Bluetooth device names and serial ports)
+_OBD_DEVICE_RE = re.compile(r'OBD|ELM327|BLUE DRIVER|VGATE', re.IGNORECASE)
+_OBD_PORT_RE = re.compile(r'OBD|ELM327|BLUETOOTH', re.IGNORECASE)
+
+# OBDProtocol settings mapped to python-obd protocol classes (None lets the adapter auto-detect)
+_PROTOCOL_MAP = {
+    OBDProtocol.AUTO: None,
+    OBDProtocol.SAE_J1850_PWM: obd.protocols.SAE_J1850_PWM,
+    OBDProtocol.SAE_J1850_VPW: obd.protocols.SAE_J1850_VPW,
+    OBDProtocol.ISO_14230_4: obd.protocols.ISO_14230_4_5baud,
+    OBDProtocol.ISO_15765_4: obd.protocols.ISO_15765_4_11bit_500k,
+    OBDProtocol.ISO_9141_2: obd.protocols.ISO_9141_2,
+}
+
+# Leading numeric part of a value string that still carries its unit
+NUMBER_RE = re.compile(r'[\d\.]+')
+
 
 class OBDConnectionError(Exception):
     """Exception raised when OBD connection fails."""
@@ -49,8 +66,10 @@ class PersistentOBDInterfaceManager:
         self._connection: Optional[obd.OBD] = None
         self._is_connected = False
         self._supported_commands: List[obd.OBDCommand] = []
+        self._supported_set: frozenset = frozenset()  # O(1) membership for query()
         self._connection_lock = asyncio.Lock()
         self._query_lock = asyncio.Lock()  # Add a lock for queries
+        self._state_changed = asyncio.Event()  # Set whenever connected/disconnected flips
         
         self._keep_alive_task: Optional[asyncio.Task] = None
         self._keep_alive_interval = 15
@@ -61,6 +80,10 @@ class PersistentOBDInterfaceManager:
         self._retry_delay = 0.5
         self._auto_reconnect = True
         
+        # Skip the ATI health probe if the adapter answered this recently (seconds)
+        self._health_check_interval = 5.0
+        self._last_response_time = 0.0
+        
     @property
     def is_connected(self) -> bool:
         # Check if we think we're connected
@@ -81,6 +104,29 @@ class PersistentOBDInterfaceManager:
         logger.debug(f"Connection appears to be alive")
         return True
     
+    def _mark_connected(self):
+        self._is_connected = True
+        self._state_changed.set()
+    
+    def _mark_disconnected(self):
+        self._is_connected = False
+        self._last_response_time = 0.0
+        self._state_changed.set()
+    
+    async def wait_for_state_change(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the connection state changes instead of polling it.
+        
+        Returns:
+            True if the state changed, False if the timeout expired first
+        """
+        try:
+            await asyncio.wait_for(self._state_changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._state_changed.clear()
+        return True
+    
     async def connect(self, config: Optional[OBDConnectionConfig] = None) -> OBDResponse:
         async with self._connection_lock:
             if self.is_connected:
@@ -131,15 +177,7 @@ class PersistentOBDInterfaceManager:
         for attempt in range(self._max_retries):
             try:
                 port = self.config.port if self.config.port != "auto" else None
-                protocol_map = {
-                    OBDProtocol.AUTO: None,
-                    OBDProtocol.SAE_J1850_PWM: obd.protocols.SAE_J1850_PWM,
-                    OBDProtocol.SAE_J1850_VPW: obd.protocols.SAE_J1850_VPW,
-                    OBDProtocol.ISO_14230_4: obd.protocols.ISO_14230_4_5baud,
-                    OBDProtocol.ISO_15765_4: obd.protocols.ISO_15765_4_11bit_500k,
-                    OBDProtocol.ISO_9141_2: obd.protocols.ISO_9141_2,
-                }
-                protocol = protocol_map.get(self.config.protocol)
+                protocol = _PROTOCOL_MAP.get(self.config.protocol)
                 
                 logger.info(f"Attempting to establish OBD connection - Attempt {attempt + 1}")
                 logger.info(f"Port: {port}, Baudrate: {self.config.baudrate}, Protocol: {protocol}")
@@ -162,8 +200,9 @@ class PersistentOBDInterfaceManager:
                 if not self._connection.is_connected():
                     raise OBDConnectionError("Failed to establish OBD connection")
                     
-                self._is_connected = True
+                self._mark_connected()
                 self._supported_commands = list(self._connection.supported_commands)
+                self._supported_set = frozenset(self._supported_commands)
                 logger.info(f"Connected to OBD adapter on {self._connection.port_name()}")
                 logger.info(f"Protocol: {self._connection.protocol_name()}")
                 return
@@ -214,7 +253,7 @@ class PersistentOBDInterfaceManager:
             await loop.run_in_executor(None, self._connection.query, obd.commands.ELM_VERSION)
         except Exception as e:
             logger.warning(f"Keep-alive command failed: {e}")
-            self._is_connected = False
+            self._mark_disconnected()
     
     async def _connection_monitor_worker(self):
         while True:
@@ -222,7 +261,10 @@ class PersistentOBDInterfaceManager:
                 if not self.is_connected and self._auto_reconnect:
                     logger.warning("Connection lost, attempting to reconnect...")
                     await self.reconnect()
-                await asyncio.sleep(self._monitor_interval)
+                    # reconnect() flips the state itself; don't let that skip the retry delay
+                    self._state_changed.clear()
+                # Wake early when the keep-alive or a query reports a lost connection
+                await self.wait_for_state_change(self._monitor_interval)
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -236,8 +278,9 @@ class PersistentOBDInterfaceManager:
                 if self._connection:
                     self._connection.close()
                 self._connection = None
-                self._is_connected = False
+                self._mark_disconnected()
                 self._supported_commands = []
+                self._supported_set = frozenset()
                 logger.info("Successfully disconnected from OBD adapter")
                 return OBDResponse(success=True, data={"status": "disconnected"}, timestamp=datetime.now())
             except Exception as e:
@@ -253,13 +296,16 @@ class PersistentOBDInterfaceManager:
             # Send a simple command to test connection
             loop = asyncio.get_event_loop()
             response = await loop.run_in_executor(None, self._connection.query, obd.commands.ELM_VERSION)
-            return response is not None and not response.is_null()
+            healthy = response is not None and not response.is_null()
+            if healthy:
+                self._last_response_time = time.monotonic()
+            return healthy
         except Exception as e:
             logger.debug(f"Connection health test failed: {e}")
             return False
 
     async def query(self, command: obd.OBDCommand) -> OBDResponse:
-        logger.info(f"Querying OBD command: {command.name}")
+        logger.debug(f"Querying OBD command: {command.name}")
         if not self.is_connected:
             logger.warning("Not connected to OBD adapter")
             if self._auto_reconnect:
@@ -270,8 +316,14 @@ class PersistentOBDInterfaceManager:
             else:
                 return OBDResponse(success=False, data=None, error_message="Not connected to OBD adapter")
         
-        # Test connection health before executing the main query
-        if not await self._test_connection_health():
+        # Skip commands the vehicle did not advertise; they would only come back as NO DATA
+        if self._supported_set and command not in self._supported_set:
+            logger.debug(f"Command {command.name} not supported by vehicle, skipping query")
+            return OBDResponse(success=False, data=None, error_message=f"Command {command.name} not supported by vehicle")
+        
+        # Test connection health before executing the main query, unless the adapter just answered
+        recently_answered = time.monotonic() - self._last_response_time < self._health_check_interval
+        if not recently_answered and not await self._test_connection_health():
             logger.warning("Connection health check failed, attempting to reconnect")
             if self._auto_reconnect:
                 reconnect_result = await self.reconnect()
@@ -281,10 +333,10 @@ class PersistentOBDInterfaceManager:
         
         for attempt in range(2):  # Reduced from 3
             try:
-                logger.info(f"Executing query attempt {attempt + 1}")
+                logger.debug(f"Executing query attempt {attempt + 1}")
                 loop = asyncio.get_event_loop()
                 response = await loop.run_in_executor(None, self._connection.query, command)
-                logger.info(f"Query response: {response}")
+                logger.debug(f"Query response: {response}")
                 
                 if response.is_null():
                     logger.warning(f"Null response for command {command.name}")
@@ -293,6 +345,8 @@ class PersistentOBDInterfaceManager:
                         continue
                     return OBDResponse(success=False, data=None, error_message=f"No data for command {command.name}")
                 
+                self._last_response_time = time.monotonic()
+                
                 # Extract numeric value from response, handling units properly
                 value = response.value
                 unit = str(response.unit) if response.unit else None
@@ -304,8 +358,7 @@ class PersistentOBDInterfaceManager:
                 elif isinstance(value, str) and ' ' in value:
                     # If it's a string with spaces, it likely has units attached
                     # Try to extract the numeric part
-                    import re
-                    match = re.search(r'[\d\.]+', value)
+                    match = NUMBER_RE.search(value)
                     if match:
                         try:
                             value = float(match.group())
@@ -320,7 +373,7 @@ class PersistentOBDInterfaceManager:
             except (OSError, serial.SerialException) as e:
                 logger.error(f"Serial error executing query {command.name} (attempt {attempt + 1}): {e}")
                 # Mark connection as disconnected due to serial error
-                self._is_connected = False
+                self._mark_disconnected()
                 if self._connection:
                     try:
                         self._connection.close()
@@ -416,14 +469,16 @@ class BluetoothOBDInterfaceManager(PersistentOBDInterfaceManager):
             return []
 
     def _is_obd_device(self, name: str) -> bool:
-        return any(k in name.upper() for k in ['OBD', 'ELM327', 'OBDII', 'BLUE DRIVER', 'VGATE'])
+        return _OBD_DEVICE_RE.search(name) is not None
 
     def _find_obd_serial_port(self) -> Optional[str]:
         logger.info("🔍 Looking for OBD serial port...")
+        # Imported lazily: port enumeration is only used on the macOS connection path
+        import serial.tools.list_ports
         try:
             ports = list(serial.tools.list_ports.comports())
             for p in ports:
-                is_obd = any(k in (p.description or "").upper() or k in p.device.upper() for k in ['OBD', 'ELM327', 'BLUETOOTH'])
+                is_obd = _OBD_PORT_RE.search(p.device) or _OBD_PORT_RE.search(p.description or "")
                 if is_obd and 'INCOMING-PORT' not in p.device.upper():
                     logger.info(f"✅ Found likely OBD port: {p.device}")
                     return p.device
@@ -6,8 +6,6 @@ including settings persistence, auto-detection, and connection profiles.
 """
 
 import json
-import os
-import serial.tools.list_ports
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import asdict
@@ -15,6 +13,10 @@ from dataclasses import asdict
 from .obd_models import OBDConnectionConfig, OBDProtocol
 
 
+# Common OBD adapter / USB-serial bridge identifiers (uppercase)
+OBD_PORT_PATTERNS = ("ELM327", "OBD", "USB SERIAL", "FTDI", "CH340", "CP2102", "PL2303")
+
+
 class OBDConfigManager:
     """
     Manager for OBD configuration settings and connection profiles.
@@ -174,6 +176,9 @@ class OBDConfigManager:
         Returns:
             List of dictionaries with port information
         """
+        # Imported lazily: pyserial's port enumeration is only needed when listing ports
+        import serial.tools.list_ports
+        
         ports = []
         for port in serial.tools.list_ports.comports():
             ports.append({
@@ -190,26 +195,13 @@ class OBDConfigManager:
         Returns:
             Port name if detected, None otherwise
         """
-        # Look for common OBD adapter patterns
-        obd_patterns = [
-            "ELM327",
-            "OBD",
-            "USB Serial",
-            "FTDI",
-            "CH340",
-            "CP2102",
-            "PL2303"
-        ]
-        
         ports = self.get_available_ports()
         
         for port in ports:
-            description = port["description"].upper()
-            manufacturer = port["manufacturer"].upper()
-            
-            for pattern in obd_patterns:
-                if pattern in description or pattern in manufacturer:
-                    return port["device"]
+            # Search description and manufacturer together in one uppercase pass
+            blob = f"{port['description'] or ''}|{port['manufacturer']}".upper()
+            if any(pattern in blob for pattern in OBD_PORT_PATTERNS):
+                return port["device"]
         
         # If no specific OBD adapter found, return first available port
         if ports:
@@ -5,7 +5,7 @@ This module defines the data models used for OBD-II integration including
 DTC information, live data readings, vehicle information, and connection configuration.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any
@@ -70,7 +70,7 @@ class DTCInfo:
             self.timestamp = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class LiveDataReading:
     """Real-time OBD parameter reading."""
     pid: str  # Parameter ID
@@ -80,19 +80,20 @@ class LiveDataReading:
     min_value: Optional[float] = None  # Minimum expected value
     max_value: Optional[float] = None  # Maximum expected value
     timestamp: datetime = None  # Reading timestamp
+    in_range: bool = field(init=False, default=True)  # Range check, computed once at ingestion
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
+        self.in_range = not (
+            (self.min_value is not None and self.value < self.min_value)
+            or (self.max_value is not None and self.value > self.max_value)
+        )
     
     @property
     def is_within_range(self) -> bool:
         """Check if the current value is within expected range."""
-        if self.min_value is not None and self.value < self.min_value:
-            return False
-        if self.max_value is not None and self.value > self.max_value:
-            return False
-        return True
+        return self.in_range
 
 
 @dataclass
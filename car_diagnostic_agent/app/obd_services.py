@@ -11,7 +11,7 @@ import obd
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 
-from .bluetooth_obd_interface import PersistentOBDInterfaceManager as OBDInterfaceManager
+from .bluetooth_obd_interface import PersistentOBDInterfaceManager as OBDInterfaceManager, NUMBER_RE
 from .obd_models import (
     DTCInfo, 
     DTCStatus, 
@@ -25,6 +25,94 @@ from .obd_models import (
 
 logger = logging.getLogger(__name__)
 
+# Normal min/max ranges for common parameters.
+# These ranges are general guidelines and may vary by vehicle.
+PARAMETER_RANGES: Dict[str, tuple[float, float]] = {
+    # RPM - typical idle range, max varies by engine
+    "0C": (600.0, 4000.0),
+    
+    # Coolant Temperature - Celsius
+    "05": (80.0, 105.0),
+    
+    # Intake Air Temperature - Celsius
+    "0F": (-40.0, 60.0),
+    
+    # Throttle Position - Percentage
+    "11": (0.0, 100.0),
+    
+    # Engine Load - Percentage
+    "04": (0.0, 100.0),
+    
+    # Vehicle Speed - km/h
+    "0D": (0.0, 250.0),
+    
+    # Mass Air Flow - grams/second
+    "10": (0.0, 300.0),
+    
+    # Intake Manifold Pressure - kPa
+    "0B": (20.0, 120.0),
+    
+    # Fuel Level - Percentage
+    "2F": (0.0, 100.0),
+    
+    # Control Module Voltage - Volts
+    "42": (10.0, 15.0),
+    
+    # Absolute Load Value - Percentage
+    "43": (0.0, 100.0),
+    
+    # Ethanol Fuel Percentage
+    "52": (0.0, 100.0),
+    
+    # Ambient Air Temperature - Celsius
+    "46": (-40.0, 50.0),
+}
+
+
+# Common PID to command mappings
+PID_COMMANDS: Dict[str, obd.OBDCommand] = {
+    "0C": obd.commands.RPM,
+    "05": obd.commands.COOLANT_TEMP,
+    "11": obd.commands.THROTTLE_POS,
+    "0D": obd.commands.SPEED,
+    "0F": obd.commands.INTAKE_TEMP,
+    "10": obd.commands.MAF,
+    "04": obd.commands.ENGINE_LOAD,
+    "0B": obd.commands.INTAKE_PRESSURE,
+    "2F": obd.commands.FUEL_LEVEL,
+    "42": obd.commands.CONTROL_MODULE_VOLTAGE,
+}
+
+
+# Critical DTC prefixes (misfires, catalyst issues) and warning DTC prefixes (fuel system issues)
+CRITICAL_DTC_PREFIXES = ("P0300", "P030", "P0420", "P0430")
+WARNING_DTC_PREFIXES = ("P0171", "P0172", "P0174", "P0175")
+
+# Basic DTC descriptions - leveraging Gemini's knowledge rather than maintaining large database
+DTC_DESCRIPTIONS: Dict[str, str] = {
+    "P0100": "Mass or Volume Air Flow Circuit Malfunction",
+    "P0101": "Mass or Volume Air Flow Circuit Range/Performance Problem",
+    "P0102": "Mass or Volume Air Flow Circuit Low Input",
+    "P0103": "Mass or Volume Air Flow Circuit High Input",
+    "P0171": "System Too Lean (Bank 1)",
+    "P0172": "System Too Rich (Bank 1)",
+    "P0174": "System Too Lean (Bank 2)",
+    "P0175": "System Too Rich (Bank 2)",
+    "P0300": "Random/Multiple Cylinder Misfire Detected",
+    "P0301": "Cylinder 1 Misfire Detected",
+    "P0302": "Cylinder 2 Misfire Detected",
+    "P0303": "Cylinder 3 Misfire Detected",
+    "P0304": "Cylinder 4 Misfire Detected",
+    "P0420": "Catalyst System Efficiency Below Threshold (Bank 1)",
+    "P0430": "Catalyst System Efficiency Below Threshold (Bank 2)",
+    "P0442": "Evaporative Emission Control System Leak Detected (small leak)",
+    "P0443": "Evaporative Emission Control System Purge Control Valve Circuit Malfunction",
+    "P0500": "Vehicle Speed Sensor Malfunction",
+    "P0505": "Idle Control System Malfunction",
+    "P0506": "Idle Control System RPM Lower Than Expected",
+    "P0507": "Idle Control System RPM Higher Than Expected",
+}
+
 
 class DTCReaderService:
     """
@@ -42,34 +130,7 @@ class DTCReaderService:
             obd_manager: OBD Interface Manager instance
         """
         self.obd_manager = obd_manager
-        self._dtc_descriptions = self._load_dtc_descriptions()
-    
-    def _load_dtc_descriptions(self) -> Dict[str, str]:
-        """Load DTC code descriptions."""
-        # Basic DTC descriptions - leveraging Gemini's knowledge rather than maintaining large database
-        return {
-            "P0100": "Mass or Volume Air Flow Circuit Malfunction",
-            "P0101": "Mass or Volume Air Flow Circuit Range/Performance Problem",
-            "P0102": "Mass or Volume Air Flow Circuit Low Input",
-            "P0103": "Mass or Volume Air Flow Circuit High Input",
-            "P0171": "System Too Lean (Bank 1)",
-            "P0172": "System Too Rich (Bank 1)",
-            "P0174": "System Too Lean (Bank 2)",
-            "P0175": "System Too Rich (Bank 2)",
-            "P0300": "Random/Multiple Cylinder Misfire Detected",
-            "P0301": "Cylinder 1 Misfire Detected",
-            "P0302": "Cylinder 2 Misfire Detected",
-            "P0303": "Cylinder 3 Misfire Detected",
-            "P0304": "Cylinder 4 Misfire Detected",
-            "P0420": "Catalyst System Efficiency Below Threshold (Bank 1)",
-            "P0430": "Catalyst System Efficiency Below Threshold (Bank 2)",
-            "P0442": "Evaporative Emission Control System Leak Detected (small leak)",
-            "P0443": "Evaporative Emission Control System Purge Control Valve Circuit Malfunction",
-            "P0500": "Vehicle Speed Sensor Malfunction",
-            "P0505": "Idle Control System Malfunction",
-            "P0506": "Idle Control System RPM Lower Than Expected",
-            "P0507": "Idle Control System RPM Higher Than Expected",
-        }
+        self._dtc_descriptions = DTC_DESCRIPTIONS
     
     async def read_stored_dtcs(self) -> List[DTCInfo]:
         """
@@ -94,19 +155,19 @@ class DTCReaderService:
             dtc_data = response.data.get("value", [])
             
             if isinstance(dtc_data, list):
-                for dtc_tuple in dtc_data:
-                    if isinstance(dtc_tuple, tuple) and len(dtc_tuple) >= 2:
-                        code = dtc_tuple[0]
-                        description = self._dtc_descriptions.get(code, "Unknown DTC")
-                        
-                        dtc_info = DTCInfo(
-                            code=code,
-                            description=description,
-                            severity=self._determine_severity(code),
-                            status=DTCStatus.STORED,
-                            timestamp=datetime.now()
-                        )
-                        dtcs.append(dtc_info)
+                descriptions = self._dtc_descriptions
+                now = datetime.now()
+                dtcs = [
+                    DTCInfo(
+                        code=dtc_tuple[0],
+                        description=descriptions.get(dtc_tuple[0], "Unknown DTC"),
+                        severity=self._determine_severity(dtc_tuple[0]),
+                        status=DTCStatus.STORED,
+                        timestamp=now
+                    )
+                    for dtc_tuple in dtc_data
+                    if isinstance(dtc_tuple, tuple) and len(dtc_tuple) >= 2
+                ]
             
             logger.info(f"Read {len(dtcs)} stored DTCs")
             return dtcs
@@ -187,17 +248,11 @@ class DTCReaderService:
         Returns:
             DTCSeverity level
         """
-        # Critical DTCs (examples)
-        critical_patterns = ["P0300", "P030", "P0420", "P0430"]  # Misfires, catalyst issues
-        warning_patterns = ["P0171", "P0172", "P0174", "P0175"]  # Fuel system issues
-        
-        for pattern in critical_patterns:
-            if dtc_code.startswith(pattern):
-                return DTCSeverity.CRITICAL
+        if dtc_code.startswith(CRITICAL_DTC_PREFIXES):
+            return DTCSeverity.CRITICAL
         
-        for pattern in warning_patterns:
-            if dtc_code.startswith(pattern):
-                return DTCSeverity.WARNING
+        if dtc_code.startswith(WARNING_DTC_PREFIXES):
+            return DTCSeverity.WARNING
         
         return DTCSeverity.INFO
 
@@ -233,53 +288,10 @@ class LiveDataService:
         Returns:
             Tuple of (min_value, max_value) or (None, None) if not defined
         """
-        # Define normal ranges for common parameters
-        # These ranges are general guidelines and may vary by vehicle
-        parameter_ranges = {
-            # RPM - typical idle range, max varies by engine
-            "0C": (600.0, 8000.0) if current_value > 5000 else (600.0, 4000.0),
-            
-            # Coolant Temperature - Celsius
-            "05": (80.0, 105.0),
-            
-            # Intake Air Temperature - Celsius
-            "0F": (-40.0, 60.0),
-            
-            # Throttle Position - Percentage
-            "11": (0.0, 100.0),
-            
-            # Engine Load - Percentage
-            "04": (0.0, 100.0),
-            
-            # Vehicle Speed - km/h
-            "0D": (0.0, 250.0),
-            
-            # Mass Air Flow - grams/second
-            "10": (0.0, 300.0),
-            
-            # Intake Manifold Pressure - kPa
-            "0B": (20.0, 120.0),
-            
-            # Fuel Level - Percentage
-            "2F": (0.0, 100.0),
-            
-            # Control Module Voltage - Volts
-            "42": (10.0, 15.0),
-            
-            # Absolute Load Value - Percentage
-            "43": (0.0, 100.0),
-            
-            # Ethanol Fuel Percentage
-            "52": (0.0, 100.0),
-            
-            # Ambient Air Temperature - Celsius
-            "46": (-40.0, 50.0),
-        }
-        
-        # Return ranges if defined, otherwise return None
-        if pid in parameter_ranges:
-            return parameter_ranges[pid]
-        return (None, None)
+        # RPM range widens for engines that are clearly being revved
+        if pid == "0C" and current_value > 5000:
+            return (600.0, 8000.0)
+        return PARAMETER_RANGES.get(pid, (None, None))
     
     async def read_parameter(self, pid: str) -> Optional[LiveDataReading]:
         """
@@ -326,8 +338,7 @@ class LiveDataService:
                         elif ' ' in value_str and not isinstance(value, (int, float)):
                             # If it contains spaces, it likely has units attached
                             # Try to extract the first numeric part
-                            import re
-                            match = re.search(r'[\d\.]+', value_str)
+                            match = NUMBER_RE.search(value_str)
                             if match:
                                 value = float(match.group())
                             else:
@@ -457,21 +468,7 @@ class LiveDataService:
         Returns:
             OBD command object or None
         """
-        # Common PID to command mappings
-        pid_commands = {
-            "0C": obd.commands.RPM,
-            "05": obd.commands.COOLANT_TEMP,
-            "11": obd.commands.THROTTLE_POS,
-            "0D": obd.commands.SPEED,
-            "0F": obd.commands.INTAKE_TEMP,
-            "10": obd.commands.MAF,
-            "04": obd.commands.ENGINE_LOAD,
-            "0B": obd.commands.INTAKE_PRESSURE,
-            "2F": obd.commands.FUEL_LEVEL,
-            "42": obd.commands.CONTROL_MODULE_VOLTAGE,
-        }
-        
-        return pid_commands.get(pid)
+        return PID_COMMANDS.get(pid)
 
 
 class VehicleInfoService:
@@ -9,13 +9,30 @@ Features:
 - Comprehensive testing and diagnostics
 """
 
+import json
 import obd
+import re
 import serial
 import serial.tools.list_ports
 import subprocess
 import time
 import sys
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Dict, Optional, Tuple
+
+
+# Bluetooth device name fragments that identify OBD adapters (uppercase)
+OBD_DEVICE_KEYWORDS = ('OBD', 'ELM327', 'BLUE DRIVER', 'VGATE')
+
+# Serial port name/description fragments that suggest an OBD adapter (uppercase)
+OBD_SERIAL_PATTERNS = ('OBD', 'ELM327', 'BLUETOOTH', 'USB SERIAL', 'FTDI', 'CH340', 'CP2102', 'PL2303')
+
+# Case-insensitive matchers built once from the keyword lists above
+_OBD_DEVICE_RE = re.compile('|'.join(map(re.escape, OBD_DEVICE_KEYWORDS)), re.IGNORECASE)
+_OBD_SERIAL_RE = re.compile('|'.join(map(re.escape, OBD_SERIAL_PATTERNS)), re.IGNORECASE)
+
+# Raw ELM327 reply fragments that confirm an adapter answered the probe
+ELM_RESPONSE_MARKERS = (b'ELM', b'OK', b'>')
 
 
 class MacOBDConnector:
@@ -24,10 +41,36 @@ class MacOBDConnector:
     def __init__(self):
         self.obd_port: Optional[str] = None
         self.connection: Optional[obd.OBD] = None
+        # Enumeration results keyed by scan name: (monotonic timestamp, result)
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+
+    def _cached(self, key: str, ttl: float, fn: Callable[[], Any]) -> Any:
+        entry = self._cache.get(key)
+        now = time.monotonic()
+        if entry and now - entry[0] < ttl:
+            return entry[1]
+        result = fn()
+        self._cache[key] = (now, result)
+        return result
+
+    def invalidate_cache(self):
+        self._cache.clear()
 
     def scan_bluetooth_devices(self) -> List[Dict[str, str]]:
+        return self._cached('bluetooth', 5.0, self._scan_bluetooth_devices)
+
+    def _scan_bluetooth_devices(self) -> List[Dict[str, str]]:
         print("🔍 Scanning for Bluetooth OBD devices...")
         try:
+            result = subprocess.run(
+                ['system_profiler', '-json', 'SPBluetoothDataType'],
+                capture_output=True, timeout=15
+            )
+            if result.returncode == 0:
+                devices = self._parse_bluetooth_json(result.stdout)
+                if devices is not None:
+                    return devices
+            # Older macOS has no -json flag or a different key layout; fall back to the text report
             result = subprocess.run(
                 ['system_profiler', 'SPBluetoothDataType'],
                 capture_output=True, text=True, timeout=15
@@ -35,40 +78,68 @@ class MacOBDConnector:
             if result.returncode != 0:
                 print("⚠️  Failed to get Bluetooth information")
                 return []
-            lines = result.stdout.split('\n')
-            obd_devices, current = [], {}
-            in_section = False
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                if 'Devices' in line and ('Paired' in line or 'Connected' in line):
-                    in_section = True
-                    continue
-                if in_section:
-                    if 'Device Name:' in line:
-                        if current and self._is_obd_device(current.get('name', '')):
-                            obd_devices.append(current)
-                        current = {
-                            'name': line.split(':',1)[1].strip(),
-                            'address': '',
-                            'connected': False
-                        }
-                    elif 'Device Address:' in line and current:
-                        current['address'] = line.split(':',1)[1].strip()
-                    elif 'Connected:' in line and current:
-                        current['connected'] = 'yes' in line.split(':',1)[1].strip().lower()
-            if current and self._is_obd_device(current.get('name', '')):
-                obd_devices.append(current)
-            return obd_devices
+            return self._parse_bluetooth_text(result.stdout)
         except Exception as e:
             print(f"❌ Error scanning Bluetooth devices: {e}")
             return []
 
+    def _parse_bluetooth_json(self, output: bytes) -> Optional[List[Dict[str, str]]]:
+        """Parse `system_profiler -json` output; None when the layout is not the expected one"""
+        try:
+            controllers = json.loads(output).get('SPBluetoothDataType', [])
+        except (ValueError, AttributeError):
+            return None
+        sections = (('device_connected', True), ('device_not_connected', False))
+        if not any(key in controller for controller in controllers for key, _ in sections):
+            return None
+        obd_devices = []
+        # Each controller lists paired devices as [{name: {properties}}, ...] per connection state
+        for controller in controllers:
+            for section, connected in sections:
+                for entry in controller.get(section, []):
+                    for name, props in entry.items():
+                        if self._is_obd_device(name):
+                            obd_devices.append({
+                                'name': name,
+                                'address': props.get('device_address', ''),
+                                'connected': connected
+                            })
+        return obd_devices
+
+    def _parse_bluetooth_text(self, output: str) -> List[Dict[str, str]]:
+        obd_devices, current = [], {}
+        in_section = False
+        for line in output.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            if 'Devices' in line and ('Paired' in line or 'Connected' in line):
+                in_section = True
+                continue
+            if in_section:
+                if 'Device Name:' in line:
+                    if current and self._is_obd_device(current.get('name', '')):
+                        obd_devices.append(current)
+                    current = {
+                        'name': line.split(':',1)[1].strip(),
+                        'address': '',
+                        'connected': False
+                    }
+                elif 'Device Address:' in line and current:
+                    current['address'] = line.split(':',1)[1].strip()
+                elif 'Connected:' in line and current:
+                    current['connected'] = 'yes' in line.split(':',1)[1].strip().lower()
+        if current and self._is_obd_device(current.get('name', '')):
+            obd_devices.append(current)
+        return obd_devices
+
     def _is_obd_device(self, name: str) -> bool:
-        return any(k in name.upper() for k in ['OBD', 'ELM327', 'OBDII', 'BLUE DRIVER', 'VGATE'])
+        return _OBD_DEVICE_RE.search(name) is not None
 
     def scan_serial_ports(self) -> List[Dict[str, str]]:
+        return self._cached('serial', 3.0, self._scan_serial_ports)
+
+    def _scan_serial_ports(self) -> List[Dict[str, str]]:
         print("🔌 Scanning for serial ports...")
         try:
             ports = list(serial.tools.list_ports.comports())
@@ -87,22 +158,32 @@ class MacOBDConnector:
             return []
 
     def _is_obd_serial_port(self, port) -> bool:
-        name = port.device.upper()
-        desc = (port.description or "").upper()
-        patterns = ['OBD', 'ELM327', 'BLUETOOTH', 'USB SERIAL', 'FTDI', 'CH340', 'CP2102', 'PL2303']
-        return any(pat in name or pat in desc for pat in patterns)
+        return bool(_OBD_SERIAL_RE.search(port.device) or _OBD_SERIAL_RE.search(port.description or ''))
 
     def find_obd_serial_port(self) -> Optional[str]:
+        ports = self.find_obd_serial_ports()
+        return ports[0] if ports else None
+
+    def find_obd_serial_ports(self) -> List[str]:
         print("🔍 Looking for OBD serial port...")
         ports = self.scan_serial_ports()
-        for p in ports:
-            dn = p['device'].upper()
-            if p['is_obd'] and 'INCOMING-PORT' not in dn:
-                print(f"✅ Found OBD port: {p['device']}")
-                return p['device']
+        found = [
+            p['device'] for p in ports
+            if p['is_obd'] and 'INCOMING-PORT' not in p['device'].upper()
+        ]
+        if found:
+            print(f"✅ Found OBD port(s): {', '.join(found)}")
+            return found
         print("⚠️  No specific OBD port found; listing all:")
         for p in ports:
             print(f"  - {p['device']} ({'OBD' if p['is_obd'] else 'non-OBD'})")
+        return []
+
+    def probe_serial_ports(self, ports: List[str]) -> Optional[str]:
+        """Probe candidate ports in order and return the first one an ELM327 answers on"""
+        for port in ports:
+            if self.test_serial_connection(port):
+                return port
         return None
 
     def test_serial_connection(self, port: str, baudrate: int = 38400) -> bool:
@@ -115,16 +196,18 @@ class MacOBDConnector:
                 write_timeout=3,
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE,
-                bytesize=serial.EIGHTBITS
+                bytesize=serial.EIGHTBITS,
+                exclusive=True  # refuse the port if another process holds it
             )
             time.sleep(1)
             ser.reset_input_buffer()
             ser.write(b"ATZ\r")
             ser.flush()
-            time.sleep(2)
-            resp = ser.read(ser.in_waiting or 128)
+            # ELM327 ends every reply with a '>' prompt; return as soon as it arrives
+            resp = ser.read_until(b">", 256)
             ser.close()
-            if resp and any(x in resp.decode(errors='ignore').upper() for x in ['ELM', 'OK', '>']):
+            resp = resp.upper()
+            if any(x in resp for x in ELM_RESPONSE_MARKERS):
                 print("✅ ELM327 response detected")
                 return True
             print("⚠️  No valid response")
@@ -133,9 +216,20 @@ class MacOBDConnector:
             print(f"❌ Serial connection failed: {e}")
             return False
 
+    def _has_live_connection(self, port: str) -> bool:
+        tty_port = port.replace('/dev/cu.', '/dev/tty.')
+        return bool(self.connection and self.connection.is_connected() and self.connection.port_name() == tty_port)
+
     def connect_with_obd_library(self, port: str) -> bool:
         print(f"🔌 Connecting with python-obd to {port}...")
         try:
+            # Reuse a live connection to the same adapter instead of repeating the ELM327 handshake
+            if self._has_live_connection(port):
+                print("✅ Reusing existing python-obd connection")
+                return True
+            if self.connection:
+                self.connection.close()
+            
             # Add delay to ensure Bluetooth connection is fully established
             time.sleep(2)
             
@@ -179,19 +273,26 @@ class MacOBDConnector:
         print("="*60)
         print("🚗 Mac OBD Connector - Diagnostics")
         print("="*60)
-        bt = self.scan_bluetooth_devices()
+        # Start each run from a fresh scan; the cache then serves find_obd_serial_ports
+        self.invalidate_cache()
+        # system_profiler can take seconds; let it run while the serial ports are enumerated
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            bt_future = pool.submit(self.scan_bluetooth_devices)
+            sp = self.scan_serial_ports()
+            bt = bt_future.result()
         if bt:
             print(f"✅ Found {len(bt)} Bluetooth devices")
         else:
             print("⚠️  No Bluetooth OBD devices found")
-        sp = self.scan_serial_ports()
         if not sp:
             print("❌ No serial ports found")
             return False
-        port = self.find_obd_serial_port()
-        if not port:
+        ports = self.find_obd_serial_ports()
+        if not ports:
             return False
-        if not self.test_serial_connection(port):
+        # A live python-obd session already holds its port, so the raw probe would only fail
+        port = next((p for p in ports if self._has_live_connection(p)), None) or self.probe_serial_ports(ports)
+        if not port:
             return False
         if not self.connect_with_obd_library(port):
             return False